@@ -1,4 +1,7 @@
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import Counter
 from datetime import datetime
 
 from blessings import Terminal
@@ -7,6 +10,7 @@ from tasks.framework import TaskFrameType, TaskStatus, Task
 
 
 class Line(ABC):
+    drawn = False
 
     @abstractmethod
     def draw(self, terminal: Terminal):
@@ -71,62 +75,186 @@ class FrameLine(Line):
         return f" => => {time_formatted} {self._colorized_type(terminal).lower()} {data_string}"
 
 
+class SkippedLine(Line):
+    def __init__(self, time: datetime):
+        self.time = time
+        self.frame_types: Counter[TaskFrameType] = Counter()
+
+    def draw(self, terminal: Terminal):
+        line_prefix = " => => "
+        skipped = ", ".join(f"+{count} {frame_type.name.lower()} frames" for frame_type, count in self.frame_types.items())
+        skipped = skipped[:terminal.width - len(line_prefix)]
+        return f"{line_prefix}{terminal.yellow(skipped)}"
+
+
 class Console:
     """
     Utility for displaying tasks in the console.
     """
 
-    def __init__(self):
+    def __init__(self, frame_rate: float = 20):
         self.terminal = Terminal()
         self.lines = []
+        self.line_counts: Counter[type] = Counter()
+        self.rows: list[str | None] = []
+        self.scrolls: list[list[int | None]] = []
+        self.skipped_line: SkippedLine | None = None
+        self.frame_interval = 1 / frame_rate
+        self.frame_time = 0.0
+        self.dirty = False
+        self.condition = threading.Condition()
 
     def _unpin_first(self, line_type) -> int:
         for i, line in enumerate(self.lines):
             if isinstance(line, line_type):
                 self.lines.pop(i)
+                self.line_counts[line_type] -= 1
+                if isinstance(line, FrameLine) and not line.drawn and self._skip(i, line):
+                    return i
+                self._scroll(i)
                 return i
 
+    def _skip(self, line_offset: int, line: FrameLine) -> bool:
+        """
+        Count a frame line which was unpinned before ever being drawn.
+        :param line_offset: The index in lines the frame line was unpinned from.
+        :param line: The frame line.
+        :return: Whether a new summary line took the place of the frame line.
+        """
+        replaced = self.skipped_line is None
+        if replaced:
+            self.skipped_line = SkippedLine(line.time)
+            self.lines.insert(line_offset, self.skipped_line)
+            self.line_counts[SkippedLine] += 1
+        self.skipped_line.frame_types[line.frame_type] += 1
+        return replaced
+
     def _unpin_one(self) -> int:
         """
         Unpin the first line deemed to be the least important.
         :return: The index of the line unpinned.
         """
-        if len([line for line in self.lines if isinstance(line, TaskLine)]) > 2:
+        if self.line_counts[TaskLine] > 2:
             return self._unpin_first(TaskLine)
-        if len([line for line in self.lines if isinstance(line, RunLine)]) > 2:
+        if self.line_counts[RunLine] > 2:
             return self._unpin_first(RunLine)
+        if self.line_counts[SkippedLine] > 1:
+            return self._unpin_first(SkippedLine)
         return self._unpin_first(FrameLine)
 
-    def _redraw_from(self, line_offset: int):
+    def _scroll(self, line_offset: int | None):
+        """
+        Record that the lines from an index onwards moved up by one, or that a line was added when the index is None.
+        :param line_offset: The index in lines the unpinned line was at, or None.
         """
-        Draw all lines from the specified index onwards.
-        :param line_offset: The index in lines to start drawing from.
+        if self.scrolls and self.scrolls[-1][0] == line_offset:
+            self.scrolls[-1][1] += 1
+        else:
+            self.scrolls.append([line_offset, 1])
+
+    def _redraw(self):
         """
-        for i, line in enumerate(self.lines[line_offset:]):
-            with self.terminal.location(0, self.terminal.height - len(self.lines) - 1 + i + line_offset):
-                line_text = line.draw(self.terminal)
+        Scroll rows as recorded since the previous redraw, then draw all lines whose text differs from what is on screen.
+        """
+        self.frame_time = time.monotonic()
+        self.dirty = False
+        for line_offset, count in self.scrolls:
+            if line_offset is None:
+                print("\n" * count, end="")
+                self.rows.extend([None] * count)
+                continue
+            count = min(count, len(self.rows) - line_offset)
+            row_offset = self.terminal.height - len(self.rows) - 1
+            row_last = row_offset + len(self.rows) - 1
+            print(self.terminal.save + self.terminal.csr(row_offset + line_offset, row_last) + self.terminal.move(row_last, 0) + "\n" * count +
+                  self.terminal.csr(0, self.terminal.height - 1) + self.terminal.restore, end="")
+            del self.rows[line_offset:line_offset + count]
+            self.rows.extend([None] * count)
+        self.scrolls.clear()
+        row_offset = self.terminal.height - len(self.lines) - 1
+        for i, line in enumerate(self.lines):
+            line.drawn = True
+            line_text = line.draw(self.terminal)
+            if self.rows[i] == line_text:
+                continue
+            self.rows[i] = line_text
+            with self.terminal.location(0, row_offset + i):
                 print(line_text + " " * (self.terminal.width - len(line_text)))
 
-    def print_line(self, line: Line):
-        self.lines.append(line)
-        if len(self.lines) >= self.terminal.height:
-            self._unpin_one()
+    def _redraw_throttled(self):
+        """
+        Redraw, unless the previous redraw was less than a frame interval ago.
+        """
+        if time.monotonic() - self.frame_time >= self.frame_interval:
+            self._redraw()
         else:
-            print()
-        self._redraw_from(0)
+            self.dirty = True
+            self.condition.notify_all()
+
+    def _redraw_delay(self) -> float | None:
+        """
+        :return: Seconds until a pending redraw is due, or None if there is nothing to redraw.
+        """
+        if not self.dirty:
+            return None
+        return max(0.0, self.frame_time + self.frame_interval - time.monotonic())
+
+    def _redraw_loop(self, stop: threading.Event):
+        """
+        Draw updates held back by the frame rate once they are due, until stopped.
+        :param stop: Event to stop on.
+        """
+        with self.condition:
+            while not stop.is_set():
+                self.condition.wait(self._redraw_delay())
+                if self._redraw_delay() == 0:
+                    self._redraw()
+
+    def flush(self):
+        """
+        Draw any updates held back by the frame rate.
+        """
+        with self.condition:
+            if self.dirty:
+                self._redraw()
+
+    def print_line(self, line: Line):
+        with self.condition:
+            self.lines.append(line)
+            self.line_counts[type(line)] += 1
+            if len(self.lines) < self.terminal.height:
+                self._scroll(None)
+            while len(self.lines) >= self.terminal.height:
+                if self._unpin_one() is None:
+                    self._scroll(None)
+                    break
+            self._redraw_throttled()
 
     def follow(self, task: Task):
+        self.skipped_line = None
         self.print_line(TaskLine(datetime.now(), task.id, task.name, datetime.now()))
         run = None
         runs = 0
-        for frame in task.task_service.frames_follow(task):
-            if frame.type == TaskFrameType.STATUS:
-                if run is None or frame.data == TaskStatus.RUN_SCHEDULED:
-                    runs += 1
-                    run = RunLine(frame.time, runs, frame.data)
-                    self.print_line(run)
-                else:
-                    run.task_status = frame.data
-                    self._redraw_from(0)
-            else:
-                self.print_line(FrameLine(frame.time, frame.type, frame.data))
+        stop = threading.Event()
+        redraw_thread = threading.Thread(target=self._redraw_loop, args=(stop,), daemon=True)
+        redraw_thread.start()
+        try:
+            for frame in task.task_service.frames_follow(task):
+                with self.condition:
+                    if frame.type == TaskFrameType.STATUS:
+                        if run is None or frame.data == TaskStatus.RUN_SCHEDULED:
+                            runs += 1
+                            run = RunLine(frame.time, runs, frame.data)
+                            self.print_line(run)
+                        else:
+                            run.task_status = frame.data
+                            self._redraw_throttled()
+                    else:
+                        self.print_line(FrameLine(frame.time, frame.type, frame.data))
+        finally:
+            with self.condition:
+                stop.set()
+                self.condition.notify_all()
+            redraw_thread.join()
+        with self.condition:
+            self._redraw()
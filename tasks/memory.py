@@ -0,0 +1,262 @@
+import heapq
+import logging
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Generator, Callable
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from tasks.framework import Task, TaskFrame, TaskFrameType, TaskStatus, TaskService
+from tasks.sqlite import Base, DbTask, DbTaskFrame, parameters_write, parameters_read, frame_data_write, frame_data_read
+
+logger = logging.getLogger(__name__)
+
+
+def data_copy(data: any) -> any:
+    """
+    Copy JSON serializable data, converting tuples to lists as a JSON round trip would.
+    :param data: The data to copy.
+    :return: The copy.
+    """
+    if isinstance(data, dict):
+        return {key: data_copy(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [data_copy(value) for value in data]
+    return data
+
+
+class MemoryTask:
+    __slots__ = ("id", "name", "parameters", "parameters_written", "scheduled_at")
+
+    def __init__(self, _id: int, name: str, parameters: dict[str, any], parameters_written: str, scheduled_at: datetime | None):
+        self.id = _id
+        self.name = name
+        self.parameters = parameters
+        self.parameters_written = parameters_written
+        self.scheduled_at = scheduled_at
+
+
+class MemoryTaskFrame:
+    __slots__ = ("id", "type", "data", "data_written", "time")
+
+    def __init__(self, _id: int, frame_type: TaskFrameType, data: any, data_written: any, time: datetime):
+        self.id = _id
+        self.type = frame_type
+        self.data = data
+        self.data_written = data_written
+        self.time = time
+
+    def frame(self) -> TaskFrame:
+        if self.type == TaskFrameType.DATA or self.type == TaskFrameType.PROGRESSION:
+            return TaskFrame(self.type, data_copy(self.data), self.time)
+        return TaskFrame(self.type, self.data, self.time)
+
+    def is_final(self) -> bool:
+        return self.type == TaskFrameType.STATUS and (self.data == TaskStatus.TASK_COMPLETED or self.data == TaskStatus.TASK_FAILED)
+
+
+class MemoryTaskService(TaskService):
+    """
+    Task service keeping all tasks and frames in process memory.
+
+    Ready tasks are kept in a heap per task name, ordered by `scheduled_at`. Heap entries are invalidated lazily; an entry
+    only counts when it still matches the task's current `scheduled_at`.
+
+    Parameters and frame data are encoded as by `SqliteTaskService` when queued or appended, so both reject the same
+    values, and the encoded form is what snapshots write. Parameters and data frames are kept decoded as copies, and
+    every read returns a fresh copy.
+
+    When a `snapshot_url` is given, state is restored from that database on creation and written back to it by `snapshot`,
+    every `snapshot_interval` seconds if set, and on `close`. Snapshots use the same schema as `SqliteTaskService`.
+    """
+
+    def __init__(self, snapshot_url: str = None, snapshot_interval: float = None):
+        if snapshot_url is None and snapshot_interval is not None:
+            raise ValueError("snapshot_interval requires a snapshot_url")
+        if snapshot_interval is not None and snapshot_interval <= 0:
+            raise ValueError("snapshot_interval must be positive")
+        self.condition = threading.Condition()
+        self.tasks: dict[int, MemoryTask] = {}
+        self.task_frames: dict[int, list[MemoryTaskFrame]] = {}
+        self.ready: dict[str, list[tuple[datetime, int]]] = {}
+        self.task_id_last = 0
+        self.frame_id_last = 0
+        self.snapshot_lock = threading.Lock()
+        self.snapshot_tasks_dirty: set[int] = set()
+        self.snapshot_frames_dirty: dict[int, int] = {}
+        self.snapshot_stop = threading.Event()
+        self.snapshot_thread = None
+        self.Session = None
+        if snapshot_url is not None:
+            engine = create_engine(snapshot_url)
+            Base.metadata.create_all(engine)
+            self.Session = sessionmaker(bind=engine)
+            self.restore()
+            if snapshot_interval is not None:
+                self.snapshot_thread = threading.Thread(target=self._snapshot_loop, args=(snapshot_interval,), daemon=True)
+                self.snapshot_thread.start()
+
+    def _ready_push(self, task: MemoryTask):
+        heapq.heappush(self.ready.setdefault(task.name, []), (task.scheduled_at, task.id))
+
+    def _ready_peek(self, name: str) -> tuple[datetime, int] | None:
+        """
+        Discard stale entries from the top of a ready heap and return the first valid one.
+        :param name: Name of the tasks in the heap.
+        :return: The earliest `(scheduled_at, task_id)` entry, or None if there is none.
+        """
+        heap = self.ready.get(name)
+        while heap:
+            scheduled_at, task_id = heap[0]
+            if self.tasks[task_id].scheduled_at == scheduled_at:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def frame_append(self, task: Task, frame: TaskFrame):
+        data_written = frame_data_write(frame.type, frame.data)
+        data = data_copy(frame.data) if frame.type == TaskFrameType.DATA or frame.type == TaskFrameType.PROGRESSION else frame.data
+        with self.condition:
+            self.frame_id_last += 1
+            memory_frames = self.task_frames.setdefault(task.id, [])
+            memory_frames.append(MemoryTaskFrame(self.frame_id_last, frame.type, data, data_written, frame.time))
+            self.snapshot_frames_dirty.setdefault(task.id, len(memory_frames) - 1)
+            self.condition.notify_all()
+
+    def frames(self, task: Task, frame_type: TaskFrameType = None) -> list[TaskFrame]:
+        with self.condition:
+            memory_frames = self.task_frames.get(task.id, [])
+            return [memory_frame.frame() for memory_frame in memory_frames if frame_type is None or memory_frame.type == frame_type]
+
+    def frames_follow(self, task: Task, resume_from_frame_id: int = -1, poll_interval: float = 0.05) -> Generator[TaskFrame, None, None]:
+        with self.condition:
+            index = bisect_right(self.task_frames.get(task.id, []), resume_from_frame_id, key=lambda memory_frame: memory_frame.id)
+        finished = False
+        while not finished:
+            with self.condition:
+                memory_frames = self.task_frames.get(task.id, [])
+                if index >= len(memory_frames):
+                    self.condition.wait(poll_interval)
+                    continue
+                batch = memory_frames[index:]
+            index += len(batch)
+            for memory_frame in batch:
+                if memory_frame.is_final():
+                    finished = True
+                yield memory_frame.frame()
+
+    def queue(self, name: str | Callable, parameters: dict[str, any], scheduled_at: datetime = None) -> Task:
+        effective_scheduled_at = scheduled_at if scheduled_at is not None else datetime.now()
+        effective_name = name if isinstance(name, str) else name.__name__
+        memory_task = MemoryTask(0, effective_name, data_copy(parameters), parameters_write(parameters), effective_scheduled_at)
+        with self.condition:
+            self.task_id_last += 1
+            memory_task.id = self.task_id_last
+            self.tasks[memory_task.id] = memory_task
+            self._ready_push(memory_task)
+            self.snapshot_tasks_dirty.add(memory_task.id)
+            return Task(memory_task.id, effective_name, parameters, self)
+
+    def task_schedule(self, task: Task, delay: timedelta):
+        with self.condition:
+            memory_task = self.tasks[task.id]
+            memory_task.scheduled_at = datetime.now() + delay
+            self._ready_push(memory_task)
+            self.snapshot_tasks_dirty.add(memory_task.id)
+
+    def task_unschedule(self, task: Task):
+        with self.condition:
+            self.tasks[task.id].scheduled_at = None
+            self.snapshot_tasks_dirty.add(task.id)
+
+    def task_next(self, allowed_names: list[str]) -> Task | None:
+        with self.condition:
+            now = datetime.now()
+            earliest = None
+            for name in allowed_names:
+                entry = self._ready_peek(name)
+                if entry is not None and entry[0] <= now and (earliest is None or entry < earliest):
+                    earliest = entry
+            if earliest is None:
+                return None
+            memory_task = self.tasks[earliest[1]]
+            return Task(memory_task.id, memory_task.name, data_copy(memory_task.parameters), self)
+
+    def restore(self):
+        """
+        Replace the in-memory state with the contents of the snapshot database.
+
+        :return:
+        """
+        if self.Session is None:
+            raise ValueError("restore requires a snapshot_url")
+        with self.snapshot_lock, self.condition, self.Session() as session:
+            self.tasks.clear()
+            self.task_frames.clear()
+            self.ready.clear()
+            for db_task in session.query(DbTask):
+                memory_task = MemoryTask(db_task.id, db_task.name, db_task.parameters_read(), db_task.parameters, db_task.scheduled_at)
+                self.tasks[memory_task.id] = memory_task
+                if memory_task.scheduled_at is not None:
+                    self._ready_push(memory_task)
+            for db_frame in session.query(DbTaskFrame).order_by(DbTaskFrame.id.asc()):
+                memory_frame = MemoryTaskFrame(db_frame.id, db_frame.type, db_frame.data_read(), db_frame.data, db_frame.time)
+                self.task_frames.setdefault(db_frame.task_id, []).append(memory_frame)
+            self.task_id_last = session.query(func.max(DbTask.id)).scalar() or 0
+            self.frame_id_last = session.query(func.max(DbTaskFrame.id)).scalar() or 0
+            self.snapshot_tasks_dirty.clear()
+            self.snapshot_frames_dirty.clear()
+
+    def snapshot(self):
+        """
+        Write tasks changed and frames appended since the last snapshot to the snapshot database.
+
+        :return:
+        """
+        if self.Session is None:
+            raise ValueError("snapshot requires a snapshot_url")
+        with self.snapshot_lock:
+            with self.condition:
+                task_ids = self.snapshot_tasks_dirty
+                frame_indices = self.snapshot_frames_dirty
+                self.snapshot_tasks_dirty = set()
+                self.snapshot_frames_dirty = {}
+                tasks = [self.tasks[task_id] for task_id in task_ids]
+                tasks = [(memory_task.id, memory_task.name, memory_task.parameters_written, memory_task.scheduled_at) for memory_task in tasks]
+                frames = [(task_id, self.task_frames[task_id][index:]) for task_id, index in frame_indices.items()]
+            try:
+                with self.Session() as session:
+                    for task_id, name, parameters, scheduled_at in tasks:
+                        session.merge(DbTask(id=task_id, name=name, parameters=parameters, scheduled_at=scheduled_at))
+                    for task_id, memory_frames in frames:
+                        for memory_frame in memory_frames:
+                            session.add(DbTaskFrame(id=memory_frame.id, task_id=task_id, type=memory_frame.type, data=memory_frame.data_written, time=memory_frame.time))
+                    session.commit()
+            except Exception:
+                with self.condition:
+                    self.snapshot_tasks_dirty |= task_ids
+                    for task_id, index in frame_indices.items():
+                        self.snapshot_frames_dirty[task_id] = min(index, self.snapshot_frames_dirty.get(task_id, index))
+                raise
+
+    def _snapshot_loop(self, interval: float):
+        while not self.snapshot_stop.wait(interval):
+            try:
+                self.snapshot()
+            except Exception:
+                logger.exception("Failed to write snapshot, retrying in %s seconds", interval)
+
+    def close(self):
+        """
+        Stop periodic snapshots and write a final snapshot, if a snapshot database is configured.
+
+        :return:
+        """
+        if self.Session is None:
+            return
+        self.snapshot_stop.set()
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()
+        self.snapshot()
@@ -11,6 +11,34 @@ from tasks.framework import Task, TaskFrame, TaskFrameType, TaskStatus, TaskServ
 Base = declarative_base()
 
 
+def parameters_write(parameters: dict[str, any]) -> str:
+    return json.dumps(parameters)
+
+
+def parameters_read(parameters: str) -> dict[str, any]:
+    return json.loads(parameters)
+
+
+def frame_data_write(frame_type: TaskFrameType, data: any) -> any:
+    if frame_type == TaskFrameType.DATA:
+        return json.dumps(data)
+    elif frame_type == TaskFrameType.PROGRESSION:
+        return json.dumps(data)
+    elif frame_type == TaskFrameType.STATUS and isinstance(data, TaskStatus):
+        return data.name
+    return data
+
+
+def frame_data_read(frame_type: TaskFrameType, data: any) -> any:
+    if frame_type == TaskFrameType.DATA:
+        return json.loads(data)
+    elif frame_type == TaskFrameType.PROGRESSION:
+        return json.loads(data)
+    elif frame_type == TaskFrameType.STATUS:
+        return TaskStatus[data]
+    return data
+
+
 class DbTask(Base):
     __tablename__ = 'tasks'
 
@@ -20,10 +48,10 @@ class DbTask(Base):
     scheduled_at = Column(DateTime)
 
     def parameters_write(self, parameters: dict[str, any]):
-        self.parameters = json.dumps(parameters)
+        self.parameters = parameters_write(parameters)
 
     def parameters_read(self):
-        return json.loads(self.parameters)
+        return parameters_read(self.parameters)
 
 
 Index('name_x_scheduled_at', DbTask.name, DbTask.scheduled_at)
@@ -40,23 +68,10 @@ class DbTaskFrame(Base):
     task = relationship('DbTask', backref='frames')
 
     def data_write(self, data: any):
-        if self.type == TaskFrameType.DATA:
-            self.data = json.dumps(data)
-        elif self.type == TaskFrameType.PROGRESSION:
-            self.data = json.dumps(data)
-        elif self.type == TaskFrameType.STATUS and isinstance(data, TaskStatus):
-            self.data = data.name
-        else:
-            self.data = data
+        self.data = frame_data_write(self.type, data)
 
     def data_read(self) -> any:
-        if self.type == TaskFrameType.DATA:
-            return json.loads(self.data)
-        elif self.type == TaskFrameType.PROGRESSION:
-            return json.loads(self.data)
-        elif self.type == TaskFrameType.STATUS:
-            return TaskStatus[self.data]
-        return self.data
+        return frame_data_read(self.type, self.data)
 
 
 Index('task_id_x_type_time', DbTaskFrame.task_id, DbTaskFrame.type, DbTaskFrame.time)
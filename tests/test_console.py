@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+from tasks.console import Console, FrameLine, RunLine, SkippedLine, TaskLine
+from tasks.framework import Task, TaskFrameType, TaskStatus
+from tasks.memory import MemoryTaskService
+from tasks.sqlite import SqliteTaskService
+
+
+class StubTerminal:
+    save = ""
+    restore = ""
+
+    def __init__(self, height: int, width: int = 80):
+        self.height = height
+        self.width = width
+        self.locations = []
+        self.scroll_regions = []
+
+    @contextmanager
+    def location(self, x: int, y: int):
+        self.locations.append(y)
+        yield
+
+    def csr(self, top: int, bottom: int):
+        self.scroll_regions.append((top, bottom))
+        return ""
+
+    def move(self, y: int, x: int):
+        return ""
+
+    def __getattr__(self, name):
+        return lambda text: text
+
+
+def setup(height: int = 10, frame_rate: float = float("inf")) -> Console:
+    console = Console(frame_rate)
+    console.terminal = StubTerminal(height)
+    return console
+
+
+def flood(service: MemoryTaskService, count: int):
+    task = service.queue(name="handler", parameters={})
+    task.run()
+    for i in range(count):
+        task.log_info(f"line {i}")
+    task.task_complete()
+    return task
+
+
+def test__console__redraws_changed_rows():
+    console = setup()
+    run = RunLine(datetime.now(), 1, TaskStatus.RUN_ACTIVE)
+    console.print_line(run)
+    console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, "first"))
+    console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, "second"))
+    console.terminal.locations.clear()
+    console._redraw()
+    assert console.terminal.locations == []
+    run.task_status = TaskStatus.TASK_COMPLETED
+    console._redraw()
+    assert console.terminal.locations == [console.terminal.height - len(console.lines) - 1]
+
+
+def test__console__scrolls_full_screen():
+    console = setup()
+    console.print_line(RunLine(datetime.now(), 1, TaskStatus.RUN_ACTIVE))
+    for i in range(20):
+        console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, f"line {i}"))
+    console.terminal.locations.clear()
+    console.terminal.scroll_regions.clear()
+    console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, "last"))
+    height = console.terminal.height
+    assert console.terminal.scroll_regions == [(1, height - 2), (0, height - 1)]
+    assert console.terminal.locations == [height - 2]
+    assert console.rows == [line.draw(console.terminal) for line in console.lines]
+
+
+def test__console__flush_draws_throttled_lines():
+    console = setup(frame_rate=1)
+    console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, "first"))
+    console.print_line(FrameLine(datetime.now(), TaskFrameType.LOG_INFO, "second"))
+    assert len(console.rows) == 1
+    console.flush()
+    assert [row.endswith("second") for row in console.rows] == [False, True]
+
+
+def test__console__follow_draws_last_line_of_burst():
+    console = setup(frame_rate=20)
+    service = MemoryTaskService()
+    task = service.queue(name="handler", parameters={})
+    rows = []
+
+    def produce():
+        task.run()
+        task.log_info("first")
+        task.log_info("second")
+        time.sleep(0.2)
+        rows.extend(console.rows)
+        task.task_complete()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    console.follow(task)
+    thread.join()
+    assert rows[-1].endswith("second")
+
+
+def test__console__follow_summarizes_skipped_lines():
+    console = setup(frame_rate=0.001)
+    console.follow(flood(MemoryTaskService(), 100))
+    skipped_lines = [line for line in console.lines if isinstance(line, SkippedLine)]
+    frame_lines = [line for line in console.lines if isinstance(line, FrameLine)]
+    assert skipped_lines == [console.skipped_line]
+    assert console.skipped_line.frame_types == {TaskFrameType.LOG_INFO: 100 - len(frame_lines)}
+    assert console.skipped_line.draw(console.terminal) == f" => => +{100 - len(frame_lines)} log_info frames"
+    assert all(line.drawn for line in console.lines)
+
+
+def test__console__follow_unpins_previous_summaries():
+    console = setup(frame_rate=0.001)
+    service = MemoryTaskService()
+    console.follow(flood(service, 100))
+    console.follow(flood(service, 100))
+    assert [line for line in console.lines if isinstance(line, SkippedLine)] == [console.skipped_line]
+    assert len(console.lines) == console.terminal.height - 1
+    assert Counter(type(line) for line in console.lines) == +console.line_counts
+
+
+def test__console__skipped_line_truncated():
+    terminal = StubTerminal(10, width=40)
+    line = SkippedLine(datetime.now())
+    for frame_type in TaskFrameType:
+        line.frame_types[frame_type] += 1000
+    assert len(line.draw(terminal)) == terminal.width
+
+
+def test__console__follow_sqlite():
+    console = setup()
+    service = SqliteTaskService("sqlite+pysqlite:///:memory:")
+    task = service.queue(name="handler", parameters={})
+    task.run()
+    task.log_info("hello")
+    task.task_complete()
+    console.follow(task)
+    assert [type(line) for line in console.lines] == [TaskLine, RunLine, FrameLine]
+    assert console.rows == [line.draw(console.terminal) for line in console.lines]
+
+
+def test__console__follow_stops_redraw_thread():
+    class FailingTaskService:
+        def frames_follow(self, task):
+            raise KeyboardInterrupt()
+            yield
+
+    console = setup()
+    task = Task(1, "handler", {}, FailingTaskService())
+    threads = threading.active_count()
+    with pytest.raises(KeyboardInterrupt):
+        console.follow(task)
+    assert threading.active_count() == threads
@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from tasks.framework import TaskStatus, TaskFrame, TaskFrameType
+from tasks.memory import MemoryTaskService
+from tasks.sqlite import SqliteTaskService
+
+
+def test__memory__next_ordered_by_scheduled_at():
+    service = MemoryTaskService()
+    later = service.queue(name="handler", parameters={}, scheduled_at=datetime.now() - timedelta(seconds=1))
+    earlier = service.queue(name="other", parameters={}, scheduled_at=datetime.now() - timedelta(seconds=2))
+    service.queue(name="handler", parameters={}, scheduled_at=datetime.now() + timedelta(hours=1))
+    assert service.task_next(["handler", "other"]) == earlier
+    assert service.task_next(["handler"]) == later
+
+
+def test__memory__next_skips_unscheduled():
+    service = MemoryTaskService()
+    first = service.queue(name="handler", parameters={})
+    second = service.queue(name="handler", parameters={})
+    first.run()
+    assert service.task_next(["handler"]) == second
+    second.run()
+    assert service.task_next(["handler"]) is None
+    first.run_scheduled(timedelta(seconds=0))
+    assert service.task_next(["handler"]) == first
+
+
+def test__memory__frames_follow():
+    service = MemoryTaskService()
+    task = service.queue(name="handler", parameters={})
+    task.run()
+
+    def produce():
+        task.data("a")
+        task.task_complete()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    assert list(service.frames_follow(task, poll_interval=1)) == [
+        TaskFrame(TaskFrameType.STATUS, TaskStatus.RUN_ACTIVE),
+        TaskFrame(TaskFrameType.DATA, "a"),
+        TaskFrame(TaskFrameType.STATUS, TaskStatus.TASK_COMPLETED)
+    ]
+    thread.join()
+
+
+def test__memory__snapshot_restore(tmp_path):
+    url = f"sqlite+pysqlite:///{tmp_path / 'tasks.db'}"
+    service = MemoryTaskService(url)
+    task = service.queue(name="handler", parameters={"option": "a"})
+    task.data({"value": 1})
+    service.snapshot()
+    task.run()
+    task.task_complete()
+    service.close()
+    frames = [
+        TaskFrame(TaskFrameType.DATA, {"value": 1}),
+        TaskFrame(TaskFrameType.STATUS, TaskStatus.RUN_ACTIVE),
+        TaskFrame(TaskFrameType.STATUS, TaskStatus.TASK_COMPLETED)
+    ]
+
+    restored = MemoryTaskService(url)
+    assert restored.frames(task) == frames
+    assert restored.task_next(["handler"]) is None
+    assert restored.queue(name="handler", parameters={}).id == task.id + 1
+    assert SqliteTaskService(url).frames(task) == frames
+
+
+def test__memory__snapshot_retries_failed_write(tmp_path):
+    url = f"sqlite+pysqlite:///{tmp_path / 'tasks.db'}"
+    service = MemoryTaskService(url)
+    task = service.queue(name="handler", parameters={"option": "a"})
+    task.log_info("queued")
+    session = service.Session
+
+    def session_failing():
+        raise OSError("disk full")
+
+    service.Session = session_failing
+    with pytest.raises(OSError):
+        service.snapshot()
+    service.Session = session
+    service.snapshot()
+
+    restored = MemoryTaskService(url)
+    assert restored.task_next(["handler"]) == task
+    assert restored.frames(task) == [TaskFrame(TaskFrameType.LOG_INFO, "queued")]
+
+
+def test__memory__snapshot_requires_url():
+    service = MemoryTaskService()
+    with pytest.raises(ValueError):
+        service.snapshot()
+    with pytest.raises(ValueError):
+        service.restore()
+    with pytest.raises(ValueError):
+        MemoryTaskService(snapshot_interval=1)
+    with pytest.raises(ValueError):
+        MemoryTaskService("sqlite+pysqlite:///:memory:", snapshot_interval=0)
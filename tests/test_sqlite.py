@@ -1,9 +1,18 @@
-from tasks.framework import Task, TaskRegistry, TaskStatus, TaskFrame, TaskFrameType
+import pytest
+
+from tasks.framework import Task, TaskRegistry, TaskStatus, TaskFrame, TaskFrameType, TaskService
+from tasks.memory import MemoryTaskService
 from tasks.sqlite import SqliteTaskService
 
 
-def setup() -> (SqliteTaskService, TaskRegistry):
-    service = SqliteTaskService("sqlite+pysqlite:///:memory:")
+@pytest.fixture(params=["sqlite", "memory"])
+def service(request) -> TaskService:
+    if request.param == "memory":
+        return MemoryTaskService()
+    return SqliteTaskService("sqlite+pysqlite:///:memory:")
+
+
+def setup() -> TaskRegistry:
     registry = TaskRegistry()
 
     @registry.handler()
@@ -15,17 +24,17 @@ def setup() -> (SqliteTaskService, TaskRegistry):
         task.data(f"This is run {task.runs()}")
         raise Exception("Something went wrong")
 
-    return service, registry
+    return registry
 
 
-def test__service__create_next():
-    service, registry = setup()
+def test__service__create_next(service):
+    registry = setup()
     task = service.queue(name="handler", parameters={"option": "a"})
     assert service.task_next(["handler"]) == task
 
 
-def test__service__task_completed():
-    service, registry = setup()
+def test__service__task_completed(service):
+    registry = setup()
     task = service.queue(name="handler", parameters={"option": "a"})
     registry.run(task)
     assert service.frames(task) == [
@@ -35,8 +44,8 @@ def test__service__task_completed():
     ]
 
 
-def test__service__run_failed():
-    service, registry = setup()
+def test__service__run_failed(service):
+    registry = setup()
     task = service.queue(name="handler_erring", parameters={})
     registry.run(task)
     assert service.frames(task) == [
@@ -49,8 +58,8 @@ def test__service__run_failed():
     ]
 
 
-def test__service__task_failed():
-    service, registry = setup()
+def test__service__task_failed(service):
+    registry = setup()
     task = service.queue(name="handler_erring", parameters={})
     registry.run(task)
     registry.run(task)
@@ -82,3 +91,22 @@ def test__service__task_failed():
         TaskFrame(TaskFrameType.STATUS, TaskStatus.RUN_FAILED),
         TaskFrame(TaskFrameType.STATUS, TaskStatus.TASK_FAILED)
     ]
+
+
+def test__service__rejects_unserializable(service):
+    with pytest.raises(TypeError):
+        service.queue(name="handler", parameters={"option": object()})
+    task = service.queue(name="handler", parameters={"option": "a"})
+    with pytest.raises(TypeError):
+        task.data(object())
+
+
+def test__service__copies_parameters_and_data(service):
+    parameters = {"option": ["a"]}
+    task = service.queue(name="handler", parameters=parameters)
+    task.data({"values": [1]})
+    parameters["option"].append("b")
+    service.task_next(["handler"]).parameters["option"].append("c")
+    service.frames(task)[0].data["values"].append(2)
+    assert service.task_next(["handler"]).parameters == {"option": ["a"]}
+    assert service.frames(task) == [TaskFrame(TaskFrameType.DATA, {"values": [1]})]